@@ -1,18 +1,327 @@
-import json
+import bisect
+import functools
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import io
 import pytz
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pikepdf import Pdf, Name, Dictionary, Array, Stream
+from pikepdf import Pdf, Name, Dictionary, Array, Stream, ObjectStreamMode
 from PIL import Image
 import os
 
+# Prefer orjson for parsing HeadLight exports, falling back to the stdlib
+try:
+    import orjson as _json
+
+    loads = _json.loads
+
+    def dumps(obj: Any) -> str:
+        return _json.dumps(obj).decode()
+except ImportError:
+    import json as _json
+
+    loads = _json.loads
+    dumps = _json.dumps
+
+# ijson streams very large exports so unused sections are never materialized
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Top-level HeadLight keys read by create_field_mapping
+HEADLIGHT_KEYS = frozenset({
+    'DocumentDate', 'Timezone', 'Weather', 'Personnel', 'WorkItems',
+    'Inspector', 'Narrative', 'Equipment', 'DailyReport'
+})
+
+# Exports below this size are parsed whole with loads(), which is several times faster than
+# ijson; larger ones are streamed so their unused sections never become Python objects
+STREAM_PARSE_THRESHOLD = 64 * 1024 * 1024
+
+# JSON Schema for the parts of a HeadLight export whose types create_field_mapping relies on.
+# It mirrors the mapping's guards: sections it isinstance-checks carry no 'type', and values it
+# only reads behind `if value:` may also be any falsy JSON value, since those fall back to defaults.
+FALSY_SCHEMA = {'enum': [None, False, 0, '', [], {}]}
+TEXT_SCHEMA = {'anyOf': [{'type': 'string'}, FALSY_SCHEMA]}
+# Strings float() accepts: decimals with optional digit underscores and exponent, inf/infinity, nan
+FLOAT_STRING_PATTERN = (
+    r'^\s*[-+]?((\d(_?\d)*(\.(\d(_?\d)*)?)?|\.\d(_?\d)*)([eE][-+]?\d(_?\d)*)?'
+    r'|[iI][nN][fF]([iI][nN][iI][tT][yY])?|[nN][aA][nN])\s*$'
+)
+# Text is joined into the remarks as-is unless a timestamp is prefixed to it
+NARRATIVE_SCHEMA = {
+    'items': {
+        'if': {'properties': {'Timestamp': FALSY_SCHEMA}},
+        'then': {'properties': {'Text': TEXT_SCHEMA}},
+    },
+}
+EQUIPMENT_SCHEMA = {
+    'type': ['array', 'string', 'object'],
+    'items': {
+        'properties': {
+            'Name': TEXT_SCHEMA,
+        },
+    },
+}
+HEADLIGHT_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'Weather': {
+            'properties': {
+                'Temperature': {
+                    'anyOf': [
+                        {'type': ['number', 'boolean']},
+                        {'type': 'string', 'pattern': FLOAT_STRING_PATTERN},
+                        FALSY_SCHEMA,
+                    ]
+                },
+                'Wind': TEXT_SCHEMA,
+                'Humidity': {'anyOf': [{'type': ['number', 'boolean', 'string']}, FALSY_SCHEMA]},
+                'Conditions': TEXT_SCHEMA,
+            },
+        },
+        'Personnel': {
+            'items': {
+                # Every row is scanned for a superintendent, which substring-searches Trade
+                'properties': {
+                    'Trade': {'anyOf': [{'type': ['string', 'array', 'object']}, FALSY_SCHEMA]},
+                },
+                # Rows without a contractor are skipped before Trade and Count are tallied
+                'if': {'properties': {'Contractor': FALSY_SCHEMA}},
+                'else': {
+                    'properties': {
+                        'Contractor': {'type': ['string', 'number', 'boolean']},
+                        'Trade': TEXT_SCHEMA,
+                        'Count': {'type': ['number', 'boolean']},
+                    },
+                },
+            },
+        },
+        'WorkItems': {
+            # Only the first 20 work items are mapped
+            'items': [
+                {
+                    'properties': {
+                        'Description': {
+                            'anyOf': [
+                                {'type': 'string'},
+                                {'type': 'array', 'not': {'contains': {'const': ':'}}},
+                                {'type': 'object', 'not': {'required': [':']}},
+                            ]
+                        },
+                    },
+                },
+            ] * 20,
+        },
+        'Inspector': {
+            # Only the first inspector in a list is read
+            'items': [{'type': 'object'}],
+        },
+        'Narrative': NARRATIVE_SCHEMA,
+        'Equipment': EQUIPMENT_SCHEMA,
+        'DailyReport': {
+            # A list or string is only probed with `in`; containing a section name would index it
+            'anyOf': [
+                {
+                    'type': 'object',
+                    'properties': {
+                        'Narrative': NARRATIVE_SCHEMA,
+                        'Equipment': EQUIPMENT_SCHEMA,
+                    },
+                },
+                {'type': 'array', 'not': {'contains': {'enum': ['Narrative', 'Equipment']}}},
+                {'type': 'string', 'not': {'pattern': 'Narrative|Equipment'}},
+            ]
+        },
+    },
+}
+
+
+_UTC = pytz.UTC
+
+# Weather field prefix on page 1; rows are conditions, temperature, wind and humidity
+WEATHER_FIELD_PREFIX = 'form1[0].Page1[0].WeatherSub[0].Weather[0].'
+
+# Temperature (F) lower bounds, ascending; TEMP_FIELDS[bisect_right(...)] is the cell to check
+TEMP_THRESHOLDS = (32, 50, 70, 83)
+TEMP_FIELDS = ('Cell5', 'Cell4', 'Cell3', 'Cell2', 'Cell1')
+
+# Humidity (%) lower bounds, ascending
+HUMIDITY_THRESHOLDS = (25, 50, 75)
+HUMIDITY_FIELDS = ('Cell1', 'Cell2', 'Cell3', 'Cell4')
+
+# (keyword, cell) pairs checked in order; the first keyword found wins
+WIND_KEYWORDS = (
+    ('strong', 'Cell3'),
+    ('high', 'Cell3'),
+    ('moderate', 'Cell2'),
+    ('medium', 'Cell2'),
+)
+CONDITION_KEYWORDS = (
+    ('rain', 'Cell4'),
+    ('shower', 'Cell4'),
+    ('snow', 'Cell5'),
+    ('cloudy', 'Cell3'),
+    ('overcast', 'Cell3'),
+    ('fair', 'Cell2'),
+    ('partly', 'Cell2'),
+)
+DEFAULT_WEATHER_FIELD = 'Cell1'
+
+# Text humidity -> percentage; 'med' also matches 'medium'
+HUMIDITY_TEXT_KEYWORDS = (
+    ('dry', 25),
+    ('low', 35),
+    ('med', 60),
+    ('high', 80),
+)
+
+
+def match_keyword(text: str, keywords: tuple, default: Any) -> Any:
+    """Return the value of the first (keyword, value) pair whose keyword occurs in text"""
+    for keyword, value in keywords:
+        if keyword in text:
+            return value
+    return default
+
+
+# Personnel trade -> column in the trade totals table
+TRADE_COL = {
+    'Supervisor': 1,
+    'Superintendent': 1,  # Map Superintendent to Supervisors
+    'Operator': 2,
+    'Truck Driver': 3,
+    'Laborer': 4
+}
+
+# Other trades fill the template's Cell5[0..20] columns in order, with the trade name as header
+PERSONNEL_TABLE_PREFIX = 'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].PersonnelTable1[0].'
+EXTRA_TRADE_COLUMNS = 21
+
+# Days indexed by datetime.weekday()
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Appearance state of the day of week radio buttons (based on template inspection)
+APPEARANCE_MAP = {day: f'/{i + 1}' for i, day in enumerate(DAYS)}
+
+# Footer fields repeated in the page set master of pages 1-3
+FOOTER_FIELDS = ('WorkDate', 'Shift', 'PreparedBy', 'CertNo', 'Signature')
+FOOTER_PAGES = 3
+FOOTER_KEYS = tuple(
+    f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].{field}[0]'
+    for page_num in range(FOOTER_PAGES)
+    for field in FOOTER_FIELDS
+)
+
+# Photo field placement on page 4 as (x, y, width, height), from the template's 6 PhotoImage fields
+IMAGE_COORDS = (
+    (21.6, 573.2, 189, 142),   # Photo 1: top left
+    (324.0, 573.4, 189, 142),  # Photo 2: top right
+    (21.6, 348.4, 189, 142),   # Photo 3: middle left
+    (324.0, 347.8, 189, 142),  # Photo 4: middle right
+    (21.6, 126.4, 189, 142),   # Photo 5: bottom left
+    (324.0, 126.4, 189, 142)   # Photo 6: bottom right
+)
+
+# Checkbox states, built once rather than per write
+YES = Name('/Yes')
+OFF = Name('/Off')
+
+
+def _set_text(annot_obj: Any, value: Any):
+    """Set a text or signature field value"""
+    annot_obj['/V'] = str(value)
+
+
+def _set_button(annot_obj: Any, value: Any):
+    """Check or uncheck a button/checkbox field"""
+    state = YES if value is True or value == '/Yes' or value == 'Yes' else OFF
+    annot_obj['/V'] = state
+    annot_obj['/AS'] = state
+
+
+# Field type (/FT) -> setter used by fill_pdf_form
+FIELD_SETTERS = {
+    '/Tx': _set_text,  # Text field
+    '/Btn': _set_button,  # Button/Checkbox
+    '/Sig': _set_text,  # Signature field
+}
+
+# JPEG files start with an SOI marker followed by another marker
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+
+def load_headlight_data(raw: bytes) -> Dict[str, Any]:
+    """Parse a HeadLight JSON export, keeping only the top-level keys in HEADLIGHT_KEYS"""
+    if ijson is None or len(raw) < STREAM_PARSE_THRESHOLD:
+        data = loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError('HeadLight export must be a JSON object')
+        return {key: value for key, value in data.items() if key in HEADLIGHT_KEYS}
+
+    events = ijson.parse(io.BytesIO(raw), use_float=True)
+    if next(events, None) != ('', 'start_map', None):
+        raise ValueError('HeadLight export must be a JSON object')
+
+    data = {}
+    key = None
+    builder = None
+    for prefix, event, value in events:
+        if prefix == '':
+            # Top-level event: finish the previous value and decide whether to build the next one
+            if builder is not None:
+                data[key] = builder.value
+                builder = None
+            if event == 'map_key' and value in HEADLIGHT_KEYS:
+                key = value
+                builder = ijson.ObjectBuilder()
+        elif builder is not None:
+            builder.event(event, value)
+    return data
+
+
 class HeadLightToODOTConverter:
-    def __init__(self, odot_template_path: str):
+    def __init__(self, odot_template_path: str, template_bytes: Optional[bytes] = None):
         self.odot_template_path = odot_template_path
         self._radio_button_counters = {}
         
+        # Keep the template in memory; fill_pdf_form re-parses it per call since pikepdf edits in place
+        if template_bytes is None:
+            with open(odot_template_path, 'rb') as f:
+                template_bytes = f.read()
+        self._template_bytes = template_bytes
+        
+        # Field locations are the same in every copy of the template, so index them once
+        self._field_index, self._day_fields = self._index_template_fields()
+    
+    def _index_template_fields(self):
+        """Map each form field title to its (page index, annotation index, field type) locations"""
+        field_index: Dict[str, List[tuple]] = {}
+        day_fields: List[tuple] = []
+        
+        with Pdf.open(io.BytesIO(self._template_bytes)) as pdf:
+            for page_index, page in enumerate(pdf.pages):
+                for annot_index, annot_obj in enumerate(page.get('/Annots', [])):
+                    if '/T' in annot_obj and '/FT' in annot_obj:
+                        field_type = str(annot_obj['/FT'])
+                        field_title = str(annot_obj['/T'])
+                        field_index.setdefault(field_title, []).append((page_index, annot_index, field_type))
+                        
+                        # Day of week radio buttons are filled separately
+                        if field_type == '/Btn' and 'Day' in field_title:
+                            day_fields.append((field_title, page_index, annot_index))
+        
+        return field_index, day_fields
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _get_tz(name: str):
+        """Resolve a pytz timezone by name, caching the result"""
+        return pytz.timezone(name)
+        
     def extract_equipment_data(self, data: Dict[str, Any]) -> str:
         """Extract equipment data from HeadLight JSON"""
         equipment_list = []
@@ -127,17 +436,7 @@ class HeadLightToODOTConverter:
                 
                 # If humidity is a string, map it to a percentage
                 if isinstance(humidity, str):
-                    humidity_lower = humidity.lower()
-                    if 'dry' in humidity_lower:
-                        humidity = 25
-                    elif 'low' in humidity_lower:
-                        humidity = 35
-                    elif 'medium' in humidity_lower or 'med' in humidity_lower:
-                        humidity = 60
-                    elif 'high' in humidity_lower:
-                        humidity = 80
-                    else:
-                        humidity = 50  # Default
+                    humidity = match_keyword(humidity.lower(), HUMIDITY_TEXT_KEYWORDS, 50)
                 else:
                     # If it's already a number, use it
                     humidity = float(humidity) if humidity else 50
@@ -151,35 +450,43 @@ class HeadLightToODOTConverter:
         
         return weather_data
     
-    def get_day_of_week(self, date_str: str, timezone_str: str = 'America/Los_Angeles') -> str:
-        """Get day of week from date string, handling timezone conversion"""
+    def _parse_localized(self, date_str: str, timezone_str: str) -> Optional[datetime]:
+        """Parse a HeadLight date string, converting timestamps to the local timezone"""
+        if not date_str or not isinstance(date_str, str):
+            return None
+        
+        # Parse the date string
         try:
-            # Parse the date string
             if 'T' in date_str:
                 # ISO format with time
                 dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             else:
                 # Date only format
-                dt = datetime.strptime(date_str, '%Y-%m-%d')
-            
-            # If timezone is specified, convert to local timezone
-            if timezone_str and 'T' in date_str:
-                try:
-                    tz = pytz.timezone(timezone_str)
-                    # If the datetime is naive, assume it's UTC
-                    if dt.tzinfo is None:
-                        dt = pytz.UTC.localize(dt)
-                    # Convert to local timezone
-                    dt = dt.astimezone(tz)
-                except:
-                    # If timezone conversion fails, use the original datetime
-                    pass
-            
-            # Get day of week
-            days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            return days[dt.weekday()]
-        except:
+                return datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return None
+        
+        # If timezone is specified, convert to local timezone
+        if timezone_str and isinstance(timezone_str, str):
+            try:
+                tz = self._get_tz(timezone_str)
+                # If the datetime is naive, assume it's UTC
+                if dt.tzinfo is None:
+                    dt = _UTC.localize(dt)
+                # Convert to local timezone
+                dt = dt.astimezone(tz)
+            except (pytz.UnknownTimeZoneError, OverflowError):
+                # If timezone conversion fails, use the original datetime
+                pass
+        
+        return dt
+    
+    def get_day_of_week(self, date_str: str, timezone_str: str = 'America/Los_Angeles') -> str:
+        """Get day of week from date string, handling timezone conversion"""
+        dt = self._parse_localized(date_str, timezone_str)
+        if dt is None:
             return 'Monday'  # Default fallback
+        return DAYS[dt.weekday()]
     
     def create_field_mapping(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create mapping from HeadLight data to ODOT form fields"""
@@ -188,26 +495,15 @@ class HeadLightToODOTConverter:
         # Extract basic data
         work_date = data.get('DocumentDate', '')
         timezone = data.get('Timezone', 'America/Los_Angeles')
-        day_of_week = self.get_day_of_week(work_date, timezone)
         
-        # Format date for display
-        try:
-            if 'T' in work_date:
-                dt = datetime.fromisoformat(work_date.replace('Z', '+00:00'))
-                if timezone:
-                    try:
-                        tz = pytz.timezone(timezone)
-                        if dt.tzinfo is None:
-                            dt = pytz.UTC.localize(dt)
-                        dt = dt.astimezone(tz)
-                    except:
-                        pass
-                formatted_date = dt.strftime('%m/%d/%y')
-            else:
-                dt = datetime.strptime(work_date, '%Y-%m-%d')
-                formatted_date = dt.strftime('%m/%d/%y')
-        except:
+        # Parse the date once for both the day of week and the display date
+        dt = self._parse_localized(work_date, timezone)
+        if dt is None:
+            day_of_week = 'Monday'  # Default fallback
             formatted_date = work_date
+        else:
+            day_of_week = DAYS[dt.weekday()]
+            formatted_date = dt.strftime('%m/%d/%y')
         
         # Weather data
         weather = self.extract_weather_data(data)
@@ -215,113 +511,67 @@ class HeadLightToODOTConverter:
         # Temperature mapping - ensure it's a number
         temp = weather['temperature']
         temp_float = float(temp) if isinstance(temp, str) else temp
-        
-        if temp_float >= 83:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row2[0].Cell1[0]'] = '/Yes'
-        elif temp_float >= 70:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row2[0].Cell2[0]'] = '/Yes'
-        elif temp_float >= 50:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row2[0].Cell3[0]'] = '/Yes'
-        elif temp_float >= 32:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row2[0].Cell4[0]'] = '/Yes'
-        else:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row2[0].Cell5[0]'] = '/Yes'
+        temp_field = TEMP_FIELDS[bisect.bisect_right(TEMP_THRESHOLDS, temp_float)]
+        field_mapping[f'{WEATHER_FIELD_PREFIX}Row2[0].{temp_field}[0]'] = '/Yes'
         
         # Wind mapping
         wind = weather['wind'].lower()
-        if 'strong' in wind or 'high' in wind:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row3[0].Cell3[0]'] = '/Yes'
-        elif 'moderate' in wind or 'medium' in wind:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row3[0].Cell2[0]'] = '/Yes'
-        else:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row3[0].Cell1[0]'] = '/Yes'
+        wind_field = match_keyword(wind, WIND_KEYWORDS, DEFAULT_WEATHER_FIELD)
+        field_mapping[f'{WEATHER_FIELD_PREFIX}Row3[0].{wind_field}[0]'] = '/Yes'
         
         # Humidity mapping - humidity is already a number from extract_weather_data
         humidity = weather['humidity']
-        
-        if humidity >= 75:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row4[0].Cell4[0]'] = '/Yes'
-        elif humidity >= 50:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row4[0].Cell3[0]'] = '/Yes'
-        elif humidity >= 25:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row4[0].Cell2[0]'] = '/Yes'
-        else:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row4[0].Cell1[0]'] = '/Yes'
+        humidity_field = HUMIDITY_FIELDS[bisect.bisect_right(HUMIDITY_THRESHOLDS, humidity)]
+        field_mapping[f'{WEATHER_FIELD_PREFIX}Row4[0].{humidity_field}[0]'] = '/Yes'
         
         # Weather conditions mapping
         conditions = weather['conditions'].lower()
-        if 'rain' in conditions or 'shower' in conditions:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row1[0].Cell4[0]'] = '/Yes'
-        elif 'snow' in conditions:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row1[0].Cell5[0]'] = '/Yes'
-        elif 'cloudy' in conditions or 'overcast' in conditions:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row1[0].Cell3[0]'] = '/Yes'
-        elif 'fair' in conditions or 'partly' in conditions:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row1[0].Cell2[0]'] = '/Yes'
-        else:
-            field_mapping['form1[0].Page1[0].WeatherSub[0].Weather[0].Row1[0].Cell1[0]'] = '/Yes'
+        conditions_field = match_keyword(conditions, CONDITION_KEYWORDS, DEFAULT_WEATHER_FIELD)
+        field_mapping[f'{WEATHER_FIELD_PREFIX}Row1[0].{conditions_field}[0]'] = '/Yes'
         
         # Personnel data
-        if 'Personnel' in data:
-            personnel = data['Personnel']
-            if isinstance(personnel, list):
-                # Aggregate by contractor
-                contractor_totals = {}
-                trade_totals = {}
+        personnel = data.get('Personnel')
+        if isinstance(personnel, list):
+            # Aggregate by contractor
+            contractor_totals = {}
+            trade_totals = defaultdict(int)
+            
+            for person in personnel:
+                if not isinstance(person, dict):
+                    continue
                 
-                for person in personnel:
-                    if isinstance(person, dict):
-                        contractor = person.get('Contractor', '')
-                        trade = person.get('Trade', '')
-                        count = person.get('Count', 1)
-                        
-                        if not contractor:
-                            continue
-                        
-                        # Initialize contractor totals
-                        if contractor not in contractor_totals:
-                            contractor_totals[contractor] = 8  # Fixed 8 hours if any personnel present
-                        
-                        # Map trade to column
-                        trade_column_mapping = {
-                            'Supervisor': 1,
-                            'Superintendent': 1,  # Map Superintendent to Supervisors
-                            'Operator': 2,
-                            'Truck Driver': 3,
-                            'Laborer': 4
-                        }
-                        
-                        # Handle blank/empty trades as Laborers
-                        if not trade or trade.strip() == '':
-                            trade = 'Laborer'
-                        
-                        # Get column for this trade
-                        if trade in trade_column_mapping:
-                            col = trade_column_mapping[trade]
-                        else:
-                            # Auto-create new columns for new trades
-                            max_col = max(trade_column_mapping.values()) if trade_column_mapping else 4
-                            trade_column_mapping[trade] = max_col + 1
-                            col = max_col + 1
-                        
-                        # Sum counts by trade
-                        if trade not in trade_totals:
-                            trade_totals[trade] = 0
-                        trade_totals[trade] += count
+                contractor = person.get('Contractor') or ''
+                if not contractor:
+                    continue
+                
+                # Fixed 8 hours if any personnel present
+                contractor_totals.setdefault(contractor, 8)
                 
-                # Map contractor totals to left table
-                row = 0
-                for contractor, hours in contractor_totals.items():
-                    if row < 10:  # Limit to 10 rows
-                        field_mapping[f'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].ContractorTable[0].Row{row}[0].Cell1[0]'] = contractor
-                        field_mapping[f'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].ContractorTable[0].Row{row}[0].Cell2[0]'] = str(hours)
-                        row += 1
+                # Handle blank/empty trades as Laborers
+                trade = (person.get('Trade') or '').strip() or 'Laborer'
                 
-                # Map trade totals to right table
-                for trade, count in trade_totals.items():
-                    col = trade_column_mapping.get(trade, 4)
-                    if col <= 10:  # Limit to 10 columns
-                        field_mapping[f'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].PersonnelTable1[0].Row2[0].Cell{col}[0]'] = str(count)
+                # Sum counts by trade
+                trade_totals[trade] += person.get('Count', 1)
+            
+            # Map contractor totals to left table
+            row = 0
+            for contractor, hours in contractor_totals.items():
+                if row < 10:  # Limit to 10 rows
+                    field_mapping[f'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].ContractorTable[0].Row{row}[0].Cell1[0]'] = contractor
+                    field_mapping[f'form1[0].Page1[0].TableSub1[0].Table1[0].PersGroup[0].ContractorTable[0].Row{row}[0].Cell2[0]'] = str(hours)
+                    row += 1
+            
+            # Map trade totals to right table
+            extra_col = 0
+            for trade, count in trade_totals.items():
+                col = TRADE_COL.get(trade)
+                if col is not None:
+                    field_mapping[f'{PERSONNEL_TABLE_PREFIX}Row2[0].Cell{col}[0]'] = str(count)
+                elif extra_col < EXTRA_TRADE_COLUMNS:
+                    # Unlisted trade: label the next free Cell5 column and put its count under it
+                    field_mapping[f'{PERSONNEL_TABLE_PREFIX}Row1[0].Cell5[{extra_col}]'] = trade
+                    field_mapping[f'{PERSONNEL_TABLE_PREFIX}Row2[0].Cell5[{extra_col}]'] = str(count)
+                    extra_col += 1
         
         # Work items
         if 'WorkItems' in data:
@@ -337,17 +587,19 @@ class HeadLightToODOTConverter:
                         # Extract item number from description (e.g., "0010: MOBILIZATION" -> "0010")
                         item_no = ''
                         if ':' in description:
-                            item_no = description.split(':')[0].strip()
-                            description = description.split(':', 1)[1].strip()
+                            head, _, tail = description.partition(':')
+                            item_no = head.strip()
+                            description = tail.strip()
                         
                         # Format total
                         total = f"{quantity} {units}" if quantity and units else str(quantity) if quantity else ''
                         
                         # Map to form fields
-                        field_mapping[f'form1[0].Page1[0].TableSub2[0].Place[0].LocationTable1[0].Row{i}[0].Cell1[0]'] = location
-                        field_mapping[f'form1[0].Page1[0].TableSub2[0].Place[0].LocationTable1[0].Row{i}[0].Cell2[0]'] = item_no
-                        field_mapping[f'form1[0].Page1[0].TableSub2[0].Place[0].LocationTable1[0].Row{i}[0].Cell3[0]'] = total
-                        field_mapping[f'form1[0].Page1[0].TableSub2[0].Place[0].LocationTable1[0].Row{i}[0].Cell4[0]'] = description
+                        row_prefix = f'form1[0].Page1[0].TableSub2[0].Place[0].LocationTable1[0].Row{i}[0].'
+                        field_mapping[row_prefix + 'Cell1[0]'] = location
+                        field_mapping[row_prefix + 'Cell2[0]'] = item_no
+                        field_mapping[row_prefix + 'Cell3[0]'] = total
+                        field_mapping[row_prefix + 'Cell4[0]'] = description
         
         # Superintendent mapping to On-Site Supervisor
         superintendent_name = self.extract_superintendent_name(data)
@@ -378,12 +630,8 @@ class HeadLightToODOTConverter:
             field_mapping['form1[0].Page1[0].EquipSub1[0].Equip[0]'] = equipment
         
         # Footer fields (WorkDate, Shift, PreparedBy, CertNo, Signature) for all pages
-        for page_num in range(3):  # Pages 1, 2, 3
-            field_mapping[f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].WorkDate[0]'] = formatted_date
-            field_mapping[f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].Shift[0]'] = 'Day'
-            field_mapping[f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].PreparedBy[0]'] = 'Admin HHPR'
-            field_mapping[f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].CertNo[0]'] = classification
-            field_mapping[f'form1[0].#pageSet[0].Master1[{page_num}].SignSub[0].#area[0].Signature[0]'] = ''
+        footer_values = (formatted_date, 'Day', 'Admin HHPR', classification, '') * FOOTER_PAGES
+        field_mapping.update(zip(FOOTER_KEYS, footer_values))
         
         # Day of week radio buttons
         field_mapping['day_of_week'] = day_of_week
@@ -395,171 +643,160 @@ class HeadLightToODOTConverter:
         # Reset radio button counters for each new PDF generation
         self._radio_button_counters = {}
         
-        pdf = Pdf.open(self.odot_template_path)
-        
-        # Appearance map for radio buttons (based on template inspection)
-        appearance_map = {
-            'Monday': '/1',
-            'Tuesday': '/2', 
-            'Wednesday': '/3',
-            'Thursday': '/4',
-            'Friday': '/5',
-            'Saturday': '/6',
-            'Sunday': '/7'
-        }
+        pdf = Pdf.open(io.BytesIO(self._template_bytes))
+        
+        # Annotation arrays per page, addressed through the precomputed field index
+        page_annots = [page.get('/Annots', []) for page in pdf.pages]
         
         # Fill form fields
         for field_name, value in field_mapping.items():
             if field_name == 'day_of_week':
                 continue  # Handle day of week separately
-                
-            # Find the field in page annotations
-            for page in pdf.pages:
-                if '/Annots' in page:
-                    for annot in page['/Annots']:
-                        annot_obj = annot
-                        if '/T' in annot_obj and '/FT' in annot_obj:
-                            field_type = annot_obj['/FT']
-                            field_title = annot_obj['/T']
-                            
-                            if field_title == field_name:
-                                if field_type == '/Tx':  # Text field
-                                    annot_obj['/V'] = str(value)
-                                elif field_type == '/Btn':  # Button/Checkbox
-                                    if value is True or value == '/Yes' or value == 'Yes':
-                                        annot_obj['/V'] = '/Yes'
-                                        annot_obj['/AS'] = '/Yes'
-                                    else:
-                                        annot_obj['/V'] = '/Off'
-                                        annot_obj['/AS'] = '/Off'
-                                elif field_type == '/Sig':  # Signature field
-                                    annot_obj['/V'] = str(value)
+            
+            for page_index, annot_index, field_type in self._field_index.get(field_name, ()):
+                setter = FIELD_SETTERS.get(field_type)
+                if setter is not None:
+                    setter(page_annots[page_index][annot_index], value)
         
         # Handle day of week radio buttons
         day_of_week = field_mapping.get('day_of_week', 'Monday')
-        target_appearance = appearance_map.get(day_of_week, '/1')
+        target_appearance = APPEARANCE_MAP.get(day_of_week, '/1')
         
-        for page in pdf.pages:
-            if '/Annots' in page:
-                for annot in page['/Annots']:
-                    annot_obj = annot
-                    if '/T' in annot_obj and '/FT' in annot_obj:
-                        field_type = annot_obj['/FT']
-                        field_title = annot_obj['/T']
-                        
-                        if field_type == '/Btn' and 'Day' in field_title:
-                            # This is a day of week radio button
-                            if field_title not in self._radio_button_counters:
-                                self._radio_button_counters[field_title] = 0
-                            
-                            self._radio_button_counters[field_title] += 1
-                            
-                            # Check if this is the target day
-                            if day_of_week in field_title:
-                                annot_obj['/V'] = f'/{day_of_week}'
-                                annot_obj['/AS'] = target_appearance
-                            else:
-                                annot_obj['/V'] = '/Off'
-                                annot_obj['/AS'] = '/Off'
+        for field_title, page_index, annot_index in self._day_fields:
+            # This is a day of week radio button
+            annot_obj = page_annots[page_index][annot_index]
+            if field_title not in self._radio_button_counters:
+                self._radio_button_counters[field_title] = 0
+            
+            self._radio_button_counters[field_title] += 1
+            
+            # Check if this is the target day
+            if day_of_week in field_title:
+                annot_obj['/V'] = f'/{day_of_week}'
+                annot_obj['/AS'] = target_appearance
+            else:
+                annot_obj['/V'] = '/Off'
+                annot_obj['/AS'] = '/Off'
         
         # Embed images if provided
         if uploaded_photos:
             self._embed_images_in_pdf(pdf, uploaded_photos)
         
-        # Save to bytes
+        # Save to bytes, packing the ~500 form field dictionaries into compressed object
+        # streams; this roughly halves the file that gets sent to the browser
         output = io.BytesIO()
-        pdf.save(output)
+        pdf.save(output, object_stream_mode=ObjectStreamMode.generate)
         return output.getvalue()
     
+    def _prepare_image(self, i: int, photo: Any) -> Optional[tuple]:
+        """Read, resize and JPEG-encode one photo; returns (i, jpeg_bytes, width, height)"""
+        try:
+            # Read image data
+            if hasattr(photo, 'getvalue'):
+                # In-memory uploads (e.g. Streamlit's UploadedFile) expose their buffer directly
+                image_data = photo.getvalue()
+            else:
+                image_data = photo.read()
+                photo.seek(0)  # Reset file pointer
+            if not image_data:
+                print(f"Skipping empty image {i+1}")
+                return None
+            
+            # Open image with Pillow (only the header is parsed here)
+            image = Image.open(io.BytesIO(image_data))
+            
+            # Get field dimensions
+            _, _, width, height = IMAGE_COORDS[i]
+            
+            if (image_data[:3] == JPEG_MAGIC and image.mode == 'RGB'
+                    and image.width <= width and image.height <= height):
+                # Already an RGB JPEG that fits the field; embed the original bytes as-is
+                return i, image_data, image.width, image.height
+            
+            # thumbnail() drafts RGB JPEGs itself, but convert() below would fully decode L/CMYK ones
+            # first; drafting here lets libjpeg scale those down (1/2 to 1/8) before the conversion
+            if image.format == 'JPEG':
+                image.draft('RGB', (width * 2, height * 2))
+            
+            # Convert to RGB if necessary
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            
+            # Resize image to fit the field dimensions
+            image.thumbnail((width, height), Image.Resampling.LANCZOS)
+            
+            # Convert to bytes
+            img_buffer = io.BytesIO()
+            image.save(img_buffer, format='JPEG', quality=85)
+            return i, img_buffer.getvalue(), image.width, image.height
+        except Exception as e:
+            print(f"Error embedding image {i+1}: {e}")
+            return None
+    
     def _embed_images_in_pdf(self, pdf: Pdf, uploaded_photos: List[Any]):
         """Embed uploaded images into the PDF on the photographs page"""
-        if not uploaded_photos:
+        photos = [photo for photo in (uploaded_photos or ()) if photo is not None][:len(IMAGE_COORDS)]
+        if not photos:
             return
         
-        # Target page 4 (index 3) for photographs
+        # Decode/resize/encode photos in parallel (Pillow releases the GIL);
+        # pikepdf is not thread-safe, so the PDF is only touched on this thread
+        with ThreadPoolExecutor(max_workers=len(photos)) as executor:
+            results = [result for result in executor.map(self._prepare_image, range(len(photos)), photos)
+                       if result is not None]
+        if not results:
+            return
+        
+        # Target page 4 (index 3) for photographs; resolve its XObject resources once
         target_page = pdf.pages[3]
+        if '/Resources' not in target_page:
+            target_page['/Resources'] = Dictionary()
+        resources = target_page['/Resources']
+        if '/XObject' not in resources:
+            resources['/XObject'] = Dictionary()
+        xobjects = resources['/XObject']
         
-        # Image coordinates from the template (6 PhotoImage fields)
-        image_coords = [
-            (21.6, 573.2, 189, 142),   # Photo 1: top left
-            (324.0, 573.4, 189, 142),  # Photo 2: top right
-            (21.6, 348.4, 189, 142),   # Photo 3: middle left
-            (324.0, 347.8, 189, 142),  # Photo 4: middle right
-            (21.6, 126.4, 189, 142),   # Photo 5: bottom left
-            (324.0, 126.4, 189, 142)   # Photo 6: bottom right
-        ]
-        
-        for i, photo in enumerate(uploaded_photos):
-            if i >= 6:  # Limit to 6 images
-                break
-            
+        # Drawing operators for every embedded photo, appended as one content stream
+        content_parts = []
+        
+        for i, img_data, img_width, img_height in results:
             try:
-                # Read image data
-                image_data = photo.read()
-                photo.seek(0)  # Reset file pointer
-                
-                # Open image with Pillow
-                image = Image.open(io.BytesIO(image_data))
-                
-                # Convert to RGB if necessary
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
                 # Get coordinates and dimensions
-                x, y, width, height = image_coords[i]
-                
-                # Resize image to fit the field dimensions
-                image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                
-                # Convert to bytes
-                img_buffer = io.BytesIO()
-                image.save(img_buffer, format='JPEG', quality=85)
-                img_data = img_buffer.getvalue()
+                x, y, width, height = IMAGE_COORDS[i]
                 
                 # Create PDF XObject
                 xobj_name = f'Photo{i+1}'
                 xobj = Stream(pdf, img_data)
                 xobj['/Type'] = Name('/XObject')
                 xobj['/Subtype'] = Name('/Image')
-                xobj['/Width'] = image.width
-                xobj['/Height'] = image.height
+                xobj['/Width'] = img_width
+                xobj['/Height'] = img_height
                 xobj['/ColorSpace'] = Name('/DeviceRGB')
                 xobj['/BitsPerComponent'] = 8
                 xobj['/Filter'] = Name('/DCTDecode')
                 
                 # Add to page resources
-                if '/Resources' not in target_page:
-                    target_page['/Resources'] = Dictionary()
-                if '/XObject' not in target_page['/Resources']:
-                    target_page['/Resources']['/XObject'] = Dictionary()
+                xobjects[f'/{xobj_name}'] = xobj
                 
-                target_page['/Resources']['/XObject'][xobj_name] = xobj
+                # Draw the image scaled to the field
+                content_parts.append(f"q\n{width} 0 0 {height} {x} {y} cm\n/{xobj_name} Do\nQ\n")
                 
-                # Create content stream to draw the image
-                content_stream = f"""
-q
-{width} 0 0 {height} {x} {y} cm
-/{xobj_name} Do
-Q
-"""
-                
-                # Get existing content
-                if '/Contents' in target_page:
-                    existing_content = target_page['/Contents']
-                    if isinstance(existing_content, Array):
-                        # Multiple content streams
-                        new_stream = Stream(pdf, content_stream.encode())
-                        existing_content.append(new_stream)
-                    else:
-                        # Single content stream
-                        existing_content_data = existing_content.read_bytes()
-                        combined_content = existing_content_data + content_stream.encode()
-                        new_stream = Stream(pdf, combined_content)
-                        target_page['/Contents'] = new_stream
-                else:
-                    # No existing content
-                    new_stream = Stream(pdf, content_stream.encode())
-                    target_page['/Contents'] = new_stream
-                    
             except Exception as e:
-                print(f"
+                print(f"Error embedding image {i+1}: {e}")
+                continue
+        
+        if not content_parts:
+            return
+        
+        new_stream = Stream(pdf, ''.join(content_parts).encode())
+        if '/Contents' in target_page:
+            existing_content = target_page['/Contents']
+            if isinstance(existing_content, Array):
+                # Multiple content streams
+                existing_content.append(new_stream)
+            else:
+                # Single content stream
+                target_page['/Contents'] = Array([existing_content, new_stream])
+        else:
+            # No existing content
+            target_page['/Contents'] = new_stream
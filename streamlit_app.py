@@ -1,11 +1,19 @@
+"""Streamlit front end for the HeadLight to ODOT converter.
+
+Upload limits come from .streamlit/config.toml (server.maxUploadSize and
+server.maxMessageSize); raise them there if larger HeadLight exports are rejected.
+"""
 import streamlit as st
-import json
+import fastjsonschema
+import ijson
 import tempfile
 import os
-from converter import HeadLightToODOTConverter
-from typing import List, Dict
+import logging
+from typing import List, Dict, Tuple
 import io
 
+logger = logging.getLogger(__name__)
+
 # Set page config
 st.set_page_config(
     page_title="HeadLight to ODOT Converter",
@@ -20,12 +28,54 @@ Convert your HeadLight JSON exports to ODOT (Oregon Department of Transportation
 Upload your HeadLight JSON file and any additional photos to generate a complete ODOT report.
 """)
 
-# Initialize the converter
+def _debug_enabled() -> bool:
+    """Show tracebacks in the UI only when `debug = true` is set in the app's secrets"""
+    try:
+        return bool(st.secrets.get("debug", False))
+    except FileNotFoundError:
+        return False
+
+# Initialize the converter; the template is read once per process and kept in memory.
+# The converter module (pikepdf, Pillow) is imported here so the page renders before it loads.
 @st.cache_resource
 def get_converter():
-    return HeadLightToODOTConverter("ODOT Template.pdf")
+    from converter import HeadLightToODOTConverter
+    
+    template_path = "ODOT Template.pdf"
+    with open(template_path, "rb") as f:
+        template_bytes = f.read()
+    return HeadLightToODOTConverter(template_path, template_bytes=template_bytes)
+
+# Parse the uploaded JSON once per distinct file; Streamlit reruns the script on every interaction.
+# Only the sections the converter reads are kept; very large exports are streamed.
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def _parse_headlight(raw_bytes: bytes) -> dict:
+    from converter import load_headlight_data
+    
+    return load_headlight_data(raw_bytes)
+
+# Compile the HeadLight schema check once; fastjsonschema generates a plain Python validator
+@st.cache_resource
+def get_validator():
+    from converter import HEADLIGHT_SCHEMA
+    
+    return fastjsonschema.compile(HEADLIGHT_SCHEMA)
+
+# The field mapping depends only on the JSON, so changing just the photos reuses it
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def _mapping(json_bytes: bytes) -> dict:
+    return get_converter().create_field_mapping(_parse_headlight(json_bytes))
 
-converter = get_converter()
+# Run the whole conversion once per distinct (JSON, photos) input; repeat clicks return the cached PDF
+@st.cache_data(show_spinner=False, max_entries=4, ttl=1800)
+def _convert(json_bytes: bytes, photo_payloads: Tuple[Tuple[str, bytes], ...]) -> bytes:
+    uploaded_photos = []
+    for name, payload in photo_payloads:
+        photo = io.BytesIO(payload)
+        photo.name = name
+        uploaded_photos.append(photo)
+    
+    return get_converter().fill_pdf_form(_mapping(json_bytes), uploaded_photos)
 
 # Create two columns for file uploads
 col1, col2 = st.columns(2)
@@ -37,6 +87,7 @@ with col1:
         type=['json'],
         help="Select the JSON file exported from HeadLight"
     )
+    st.caption(f"Max upload: {st.get_option('server.maxUploadSize')} MB")
 
 with col2:
     st.subheader("📸 Additional Photos (Optional)")
@@ -47,58 +98,64 @@ with col2:
         help="Upload any additional photos you want to include in the ODOT report"
     )
 
-# Convert button
-if st.button("🔄 Convert to ODOT PDF", type="primary", disabled=json_file is None):
-    if json_file is not None:
-        try:
-            # Show progress
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # Read JSON file
-            status_text.text("Reading HeadLight JSON file...")
-            progress_bar.progress(20)
-            
-            json_content = json_file.read()
-            headlight_data = json.loads(json_content)
-            
-            # Process photos if any
-            uploaded_photos = []
-            if photo_files:
-                status_text.text("Processing uploaded photos...")
-                progress_bar.progress(40)
+# Convert button and result; a fragment so clicking it reruns only this block, not the uploaders
+@st.fragment
+def _convert_fragment(json_file, photo_files):
+    if st.button("🔄 Convert to ODOT PDF", type="primary", disabled=json_file is None):
+        if json_file is not None:
+            try:
+                # Show progress at phase boundaries only
+                with st.status("Reading HeadLight JSON file...", expanded=False) as status:
+                    json_bytes = json_file.getvalue()
+                    
+                    # Reject malformed exports before paying for the conversion
+                    try:
+                        get_validator()(_parse_headlight(json_bytes))
+                    # Checked first: JsonSchemaValueException is itself a ValueError
+                    except fastjsonschema.JsonSchemaValueException as e:
+                        status.update(label="Invalid HeadLight export", state="error")
+                        st.error(f"❌ Invalid HeadLight export: {e.message}")
+                        st.stop()
+                    except (ijson.JSONError, ValueError) as e:
+                        status.update(label="Not a valid JSON file", state="error")
+                        st.error(f"❌ Not a valid JSON file: {e}")
+                        st.stop()
+                    
+                    # Drop duplicate photos (same content under another name); bytes keys hash the content
+                    unique_photos = {}
+                    for photo_file in photo_files or []:
+                        unique_photos.setdefault(photo_file.getvalue(), photo_file.name)
+                    photo_payloads = tuple((name, payload) for payload, name in unique_photos.items())
+                    
+                    # Create field mapping and fill PDF (cached on the uploaded bytes);
+                    # the converter decodes and resizes photos in parallel
+                    status.update(label="Converting to ODOT PDF...")
+                    pdf_bytes = _convert(json_bytes, photo_payloads)
+                    
+                    status.update(label="✅ Conversion complete!", state="complete")
+                
+                # Provide download button
+                st.success("🎉 ODOT PDF generated successfully!")
+                st.download_button(
+                    label="📥 Download ODOT PDF",
+                    data=pdf_bytes,
+                    file_name=f"ODOT_Report_{json_file.name.replace('.json', '')}.pdf",
+                    mime="application/pdf"
+                )
                 
-                for photo_file in photo_files:
-                    uploaded_photos.append(photo_file)
-            
-            # Convert to ODOT PDF
-            status_text.text("Converting to ODOT PDF...")
-            progress_bar.progress(60)
-            
-            # Create field mapping and fill PDF
-            field_mapping = converter.create_field_mapping(headlight_data)
-            pdf_bytes = converter.fill_pdf_form(field_mapping, uploaded_photos)
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Conversion complete!")
-            
-            # Provide download button
-            st.success("🎉 ODOT PDF generated successfully!")
-            st.download_button(
-                label="📥 Download ODOT PDF",
-                data=pdf_bytes,
-                file_name=f"ODOT_Report_{json_file.name.replace('.json', '')}.pdf",
-                mime="application/pdf"
-            )
-            
-            # Show some stats
-            st.info(f"📊 Generated PDF with {len(uploaded_photos)} photos and HeadLight data from {json_file.name}")
-            
-        except Exception as e:
-            st.error(f"❌ Error converting file: {str(e)}")
-            st.exception(e)
-    else:
-        st.warning("⚠️ Please upload a HeadLight JSON file first.")
+                # Show some stats
+                st.info(f"📊 Generated PDF with {len(photo_payloads)} photos and HeadLight data from {json_file.name}")
+                
+            except Exception as e:
+                # Full traceback goes to the server log; the browser only gets a one-line error
+                logger.exception("conversion failed")
+                st.error(f"❌ Conversion failed: {type(e).__name__}")
+                if _debug_enabled():
+                    st.exception(e)
+        else:
+            st.warning("⚠️ Please upload a HeadLight JSON file first.")
+
+_convert_fragment(json_file, photo_files)
 
 # Add some helpful information
 st.markdown("---")